@@ -12,6 +12,7 @@ import os
 import sys
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 from typing import Dict
 from uuid import UUID, uuid4
 
@@ -111,6 +112,7 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+@lru_cache(maxsize=1 << 16)
 def calculate_failure_probability(order_id: str) -> bool:
     """
     Deterministic random failure simulation based on order_id.
@@ -119,14 +121,23 @@ def calculate_failure_probability(order_id: str) -> bool:
     This provides reproducibility for testing while maintaining
     approximately 1% failure rate across different order IDs.
 
+    The function is pure, so results are memoized with lru_cache;
+    repeated calls for the same order (retries, idempotent replays,
+    bulk tests) skip the hashing entirely.
+
     Args:
         order_id: The order identifier
 
     Returns:
         True if payment should fail, False otherwise
     """
-    # Create deterministic hash from order_id
-    hash_value = int(hashlib.sha256(order_id.encode()).hexdigest(), 16)
+    # Create deterministic hash from order_id. int.from_bytes on the
+    # raw digest avoids the hex round-trip; the full 32 bytes are used
+    # so results match the original hexdigest-based computation. The
+    # hash is a failure-rate simulation, not a security boundary, so
+    # usedforsecurity=False lets OpenSSL pick its fastest provider.
+    digest = hashlib.sha256(order_id.encode(), usedforsecurity=False).digest()
+    hash_value = int.from_bytes(digest, "big")
 
     # 1% failure rate: fail if hash mod 100 equals 0
     should_fail = (hash_value % 100) == 0
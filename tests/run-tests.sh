@@ -45,6 +45,7 @@ RUN_JAVA=true
 RUN_PYTHON=true
 VERBOSE=false
 COVERAGE=false
+PARALLEL=true
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -64,6 +65,10 @@ while [[ $# -gt 0 ]]; do
             COVERAGE=true
             shift
             ;;
+        --serial)
+            PARALLEL=false
+            shift
+            ;;
         --help|-h)
             echo "Usage: $0 [OPTIONS]"
             echo ""
@@ -72,6 +77,7 @@ while [[ $# -gt 0 ]]; do
             echo "  --python-only     Run only Python tests"
             echo "  --verbose, -v     Run tests with verbose output"
             echo "  --coverage, -c    Generate coverage reports"
+            echo "  --serial          Disable parallel test execution (pytest-xdist)"
             echo "  --help, -h        Show this help message"
             echo ""
             echo "Examples:"
@@ -148,6 +154,11 @@ if [ "$RUN_PYTHON" = true ]; then
             PYTEST_CMD="$PYTEST_CMD --cov=inventory --cov=payment --cov=webhook --cov-report=html --cov-report=term"
         fi
 
+        # Distribute tests across CPU cores when pytest-xdist is installed
+        if [ "$PARALLEL" = true ] && python -c "import xdist" 2>/dev/null; then
+            PYTEST_CMD="$PYTEST_CMD -n auto"
+        fi
+
         # Run inventory service tests
         echo "Testing Inventory Service..."
         if $PYTEST_CMD inventory-service/; then
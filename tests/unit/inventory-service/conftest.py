@@ -0,0 +1,18 @@
+"""
+Shared pytest configuration for Inventory Service unit tests.
+
+Makes the `inventory` package importable for the test modules. The
+preferred setup is an editable install (pip install -e
+services/inventory-service), which avoids per-session sys.path
+manipulation entirely; when the package is not installed, the service
+source tree is inserted on sys.path as a fallback.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+if importlib.util.find_spec("inventory") is None:
+    service_path = Path(__file__).parent.parent.parent.parent / "services" / "inventory-service" / "src"
+    if str(service_path) not in sys.path:
+        sys.path.insert(0, str(service_path))
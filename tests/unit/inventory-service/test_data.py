@@ -12,13 +12,8 @@ Workshop: From Commit to Culprit - Inventory Service Tests
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add the service to the path
-service_path = Path(__file__).parent.parent.parent.parent / "services" / "inventory-service" / "src"
-sys.path.insert(0, str(service_path))
 
+# The service source tree is added to sys.path by conftest.py
 from inventory.data import (
     get_item,
     check_availability,
@@ -31,9 +26,11 @@ from inventory.data import (
 
 @pytest.fixture(autouse=True)
 def reset_state():
-    """Reset inventory state before and after each test."""
-    reset_inventory()
-    yield
+    """Reset inventory state before each test.
+
+    Resetting once up front is enough; resetting again after the yield
+    would just duplicate the work the next test's setup already does.
+    """
     reset_inventory()
 
 
@@ -134,11 +131,13 @@ class TestReserveItems:
         assert len(reserved_items) == 2
 
         # Verify reserved items details
-        widget_reserved = next(item for item in reserved_items if item["item_id"] == "WIDGET-001")
+        reserved_by_id = {item["item_id"]: item for item in reserved_items}
+
+        widget_reserved = reserved_by_id["WIDGET-001"]
         assert widget_reserved["quantity"] == 10
         assert widget_reserved["price"] == 29.99
 
-        gadget_reserved = next(item for item in reserved_items if item["item_id"] == "GADGET-042")
+        gadget_reserved = reserved_by_id["GADGET-042"]
         assert gadget_reserved["quantity"] == 5
         assert gadget_reserved["price"] == 82.52
 
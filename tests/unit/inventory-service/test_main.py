@@ -14,38 +14,57 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
-# Import the app
-import sys
-from pathlib import Path
-
-# Add the service to the path
-service_path = Path(__file__).parent.parent.parent.parent / "services" / "inventory-service" / "src"
-sys.path.insert(0, str(service_path))
-
+# The service source tree is added to sys.path by conftest.py
 from inventory.main import app
 from inventory.data import reset_inventory
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app."""
+    """Create a test client for the FastAPI app (shared across the session)."""
     return TestClient(app)
 
 
 @pytest.fixture(autouse=True)
 def reset_inventory_state():
-    """Reset inventory to initial state before each test."""
+    """Reset inventory to initial state before each test.
+
+    Resetting once up front is enough; resetting again after the yield
+    would just duplicate the work the next test's setup already does.
+    """
     reset_inventory()
-    yield
+
+
+@pytest.fixture(scope="session")
+def baseline_summary(client):
+    """Fetch the initial inventory summary once for the whole session.
+
+    Every test starts from a freshly reset inventory, so the baseline
+    stock levels are identical for all tests and only need to be
+    fetched once.
+    """
     reset_inventory()
+    return client.get("/api/inventory/summary").json()
+
 
+@pytest.fixture(scope="class")
+def attach_client(request, client):
+    """Expose the shared TestClient as a class attribute.
 
+    Test classes opt in with @pytest.mark.usefixtures("attach_client")
+    and use self.client, instead of every method declaring the client
+    fixture in its signature.
+    """
+    request.cls.client = client
+
+
+@pytest.mark.usefixtures("attach_client")
 class TestHealthEndpoints:
     """Test health and readiness endpoints."""
 
-    def test_health_check(self, client):
+    def test_health_check(self):
         """Test health check endpoint returns healthy status."""
-        response = client.get("/health")
+        response = self.client.get("/health")
 
         assert response.status_code == 200
         data = response.json()
@@ -54,9 +73,9 @@ class TestHealthEndpoints:
         assert data["service"] == "inventory-service"
         assert "version" in data
 
-    def test_readiness_check(self, client):
+    def test_readiness_check(self):
         """Test readiness check endpoint returns ready status."""
-        response = client.get("/ready")
+        response = self.client.get("/ready")
 
         assert response.status_code == 200
         data = response.json()
@@ -68,80 +87,101 @@ class TestHealthEndpoints:
         assert data["checks"]["service_initialized"] is True
 
 
-class TestStockCheck:
-    """Test stock availability checking endpoint."""
-
-    def test_check_stock_available(self, client):
-        """Test checking stock for available items."""
-        request_data = {
+# Stock-check scenarios shared by the parametrized test below. Each case
+# carries the request payload plus the expected response, including
+# per-item detail assertions keyed by item_id.
+STOCK_CHECK_CASES = {
+    "all_available": {
+        "payload": {
             "items": [
                 {"item_id": "WIDGET-001", "quantity": 5},
                 {"item_id": "GADGET-042", "quantity": 2}
             ]
-        }
-
-        response = client.post("/api/inventory/check", json=request_data)
-
-        assert response.status_code == 200
-        data = response.json()
-
-        assert data["available"] is True
-        assert data["message"] == "All items available"
-        assert len(data["items"]) == 2
-
-        # Check first item details
-        widget_item = next(item for item in data["items"] if item["item_id"] == "WIDGET-001")
-        assert widget_item["requested"] == 5
-        assert widget_item["available"] == 1000
-        assert widget_item["in_stock"] is True
-        assert widget_item["price"] == 29.99
-
-    def test_check_stock_insufficient(self, client):
-        """Test checking stock when quantity exceeds available stock."""
-        request_data = {
+        },
+        "available": True,
+        "message": "All items available",
+        "expected_items": {
+            "WIDGET-001": {
+                "requested": 5,
+                "available": 1000,
+                "in_stock": True,
+                "price": 29.99,
+            },
+        },
+    },
+    "insufficient_stock": {
+        "payload": {
             "items": [
                 {"item_id": "WIDGET-001", "quantity": 5000}  # More than available (1000)
             ]
-        }
-
-        response = client.post("/api/inventory/check", json=request_data)
-
-        assert response.status_code == 200
-        data = response.json()
-
-        assert data["available"] is False
-        assert data["message"] == "Some items unavailable"
-        assert len(data["items"]) == 1
-
-        widget_item = data["items"][0]
-        assert widget_item["requested"] == 5000
-        assert widget_item["available"] == 1000
-        assert widget_item["in_stock"] is False
-
-    def test_check_stock_item_not_found(self, client):
-        """Test checking stock for non-existent item."""
-        request_data = {
+        },
+        "available": False,
+        "message": "Some items unavailable",
+        "expected_items": {
+            "WIDGET-001": {
+                "requested": 5000,
+                "available": 1000,
+                "in_stock": False,
+            },
+        },
+    },
+    "item_not_found": {
+        "payload": {
             "items": [
                 {"item_id": "NON-EXISTENT-ITEM", "quantity": 1}
             ]
-        }
+        },
+        "available": False,
+        "message": "Some items unavailable",
+        "expected_items": {
+            "NON-EXISTENT-ITEM": {
+                "available": 0,
+                "in_stock": False,
+            },
+        },
+        "error_items": ["NON-EXISTENT-ITEM"],
+    },
+    "mixed_availability": {
+        "payload": {
+            "items": [
+                {"item_id": "WIDGET-001", "quantity": 5},
+                {"item_id": "WIDGET-002", "quantity": 600}  # More than available (500)
+            ]
+        },
+        "available": False,
+        "message": "Some items unavailable",
+        "expected_items": {},
+    },
+}
 
-        response = client.post("/api/inventory/check", json=request_data)
+
+@pytest.mark.usefixtures("attach_client")
+class TestStockCheck:
+    """Test stock availability checking endpoint."""
+
+    @pytest.mark.parametrize("case", STOCK_CHECK_CASES.values(), ids=STOCK_CHECK_CASES.keys())
+    def test_check_stock(self, case):
+        """Test stock checking across availability scenarios."""
+        response = self.client.post("/api/inventory/check", json=case["payload"])
 
         assert response.status_code == 200
         data = response.json()
 
-        assert data["available"] is False
-        assert data["message"] == "Some items unavailable"
-        assert len(data["items"]) == 1
+        assert data["available"] is case["available"]
+        assert data["message"] == case["message"]
+        assert len(data["items"]) == len(case["payload"]["items"])
+
+        items_by_id = {item["item_id"]: item for item in data["items"]}
 
-        item = data["items"][0]
-        assert item["item_id"] == "NON-EXISTENT-ITEM"
-        assert item["available"] == 0
-        assert item["in_stock"] is False
-        assert "error" in item
+        for item_id, expected in case["expected_items"].items():
+            item = items_by_id[item_id]
+            for field, value in expected.items():
+                assert item[field] == value
 
-    def test_check_stock_missing_item_id(self, client):
+        for item_id in case.get("error_items", []):
+            assert "error" in items_by_id[item_id]
+
+    def test_check_stock_missing_item_id(self):
         """Test checking stock with missing item_id."""
         request_data = {
             "items": [
@@ -149,34 +189,17 @@ class TestStockCheck:
             ]
         }
 
-        response = client.post("/api/inventory/check", json=request_data)
+        response = self.client.post("/api/inventory/check", json=request_data)
 
         assert response.status_code == 400
         assert "item_id" in response.json()["detail"].lower()
 
-    def test_check_stock_mixed_availability(self, client):
-        """Test checking stock with some available and some unavailable items."""
-        request_data = {
-            "items": [
-                {"item_id": "WIDGET-001", "quantity": 5},
-                {"item_id": "WIDGET-002", "quantity": 600}  # More than available (500)
-            ]
-        }
-
-        response = client.post("/api/inventory/check", json=request_data)
-
-        assert response.status_code == 200
-        data = response.json()
-
-        assert data["available"] is False
-        assert data["message"] == "Some items unavailable"
-        assert len(data["items"]) == 2
-
 
+@pytest.mark.usefixtures("attach_client")
 class TestInventoryReservation:
     """Test inventory reservation endpoint."""
 
-    def test_reserve_items_success(self, client):
+    def test_reserve_items_success(self):
         """Test successful inventory reservation."""
         request_data = {
             "order_id": "order-12345",
@@ -186,7 +209,7 @@ class TestInventoryReservation:
             ]
         }
 
-        response = client.post("/api/inventory/reserve", json=request_data)
+        response = self.client.post("/api/inventory/reserve", json=request_data)
 
         assert response.status_code == 200
         data = response.json()
@@ -198,7 +221,7 @@ class TestInventoryReservation:
         assert len(data["items_reserved"]) == 2
 
         # Verify stock was deducted
-        summary_response = client.get("/api/inventory/summary")
+        summary_response = self.client.get("/api/inventory/summary")
         summary = summary_response.json()
 
         # WIDGET-001 should now have 990 (1000 - 10)
@@ -206,7 +229,7 @@ class TestInventoryReservation:
         # GADGET-042 should now have 245 (250 - 5)
         assert summary["items"]["GADGET-042"]["stock"] == 245
 
-    def test_reserve_items_insufficient_stock(self, client):
+    def test_reserve_items_insufficient_stock(self):
         """Test reservation fails when stock is insufficient."""
         request_data = {
             "order_id": "order-99999",
@@ -215,7 +238,7 @@ class TestInventoryReservation:
             ]
         }
 
-        response = client.post("/api/inventory/reserve", json=request_data)
+        response = self.client.post("/api/inventory/reserve", json=request_data)
 
         assert response.status_code == 200
         data = response.json()
@@ -226,24 +249,23 @@ class TestInventoryReservation:
         assert len(data["items_reserved"]) == 0
         assert "insufficient stock" in data["message"].lower()
 
-    def test_reserve_items_no_items(self, client):
+    def test_reserve_items_no_items(self):
         """Test reservation fails when no items provided."""
         request_data = {
             "order_id": "order-00000",
             "items": []
         }
 
-        response = client.post("/api/inventory/reserve", json=request_data)
+        response = self.client.post("/api/inventory/reserve", json=request_data)
 
         assert response.status_code == 400
         assert "no items" in response.json()["detail"].lower()
 
-    def test_reserve_items_atomic_operation(self, client):
+    def test_reserve_items_atomic_operation(self, baseline_summary):
         """Test that reservation is atomic - all or nothing."""
-        # Get initial stock levels
-        summary_before = client.get("/api/inventory/summary").json()
-        widget_stock_before = summary_before["items"]["WIDGET-001"]["stock"]
-        gadget_stock_before = summary_before["items"]["GADGET-042"]["stock"]
+        # Initial stock levels come from the session-cached baseline
+        widget_stock_before = baseline_summary["items"]["WIDGET-001"]["stock"]
+        gadget_stock_before = baseline_summary["items"]["GADGET-042"]["stock"]
 
         request_data = {
             "order_id": "order-atomic-test",
@@ -253,24 +275,25 @@ class TestInventoryReservation:
             ]
         }
 
-        response = client.post("/api/inventory/reserve", json=request_data)
+        response = self.client.post("/api/inventory/reserve", json=request_data)
 
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is False
 
         # Verify NO stock was deducted (atomic operation)
-        summary_after = client.get("/api/inventory/summary").json()
+        summary_after = self.client.get("/api/inventory/summary").json()
         assert summary_after["items"]["WIDGET-001"]["stock"] == widget_stock_before
         assert summary_after["items"]["GADGET-042"]["stock"] == gadget_stock_before
 
 
+@pytest.mark.usefixtures("attach_client")
 class TestInventorySummary:
     """Test inventory summary endpoint."""
 
-    def test_get_inventory_summary(self, client):
+    def test_get_inventory_summary(self):
         """Test retrieving inventory summary."""
-        response = client.get("/api/inventory/summary")
+        response = self.client.get("/api/inventory/summary")
 
         assert response.status_code == 200
         data = response.json()
@@ -294,7 +317,7 @@ class TestInventorySummary:
         assert widget["stock"] == 1000
         assert widget["price"] == 29.99
 
-    def test_inventory_summary_after_reservation(self, client):
+    def test_inventory_summary_after_reservation(self):
         """Test summary reflects stock changes after reservation."""
         # Reserve some items
         reserve_request = {
@@ -303,10 +326,10 @@ class TestInventorySummary:
                 {"item_id": "WIDGET-001", "quantity": 100}
             ]
         }
-        client.post("/api/inventory/reserve", json=reserve_request)
+        self.client.post("/api/inventory/reserve", json=reserve_request)
 
         # Get summary
-        response = client.get("/api/inventory/summary")
+        response = self.client.get("/api/inventory/summary")
         data = response.json()
 
         # Stock should be reduced
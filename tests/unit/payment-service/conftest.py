@@ -0,0 +1,87 @@
+"""
+Shared pytest configuration for Payment Service unit tests.
+
+Makes the `payment` package importable for the test modules. The
+preferred setup is an editable install (pip install -e
+services/payment-service), which avoids per-session sys.path
+manipulation entirely; when the package is not installed, the service
+source tree is inserted on sys.path as a fallback.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+if importlib.util.find_spec("payment") is None:
+    service_path = Path(__file__).parent.parent.parent.parent / "services" / "payment-service" / "src"
+    if str(service_path) not in sys.path:
+        sys.path.insert(0, str(service_path))
+
+# Precomputed failure bitmask for the canonical 'order-{i}' domain,
+# generated by data/generate_order_failures.py (bit i set = 'order-{i}'
+# fails).
+FAILURES_MASK_FILE = Path(__file__).parent / "data" / "order_failures.bin"
+
+
+@pytest.fixture(scope="session")
+def order_ids():
+    """The canonical 'order-{i}' ID domain, generated once per session."""
+    return [f"order-{i}" for i in range(10000)]
+
+
+@pytest.fixture(scope="session")
+def order_failure_outcomes(request, order_ids):
+    """Failure outcomes for the canonical 'order-{i}' ID space.
+
+    Several bulk tests walk the same 10,000-ID domain; computing the
+    outcomes once per session lets them share the result instead of
+    re-hashing the whole domain per test. The outcomes normally come
+    straight from the committed bitmask (see data/), which moves the
+    hashing to commit time entirely; the sampled consistency check in
+    test_failure_probability_distribution catches a stale mask. If the
+    mask is missing, outcomes are computed and persisted in pytest's
+    cache (.pytest_cache) so repeated local runs still skip the
+    hashing.
+    """
+    if FAILURES_MASK_FILE.exists():
+        mask = FAILURES_MASK_FILE.read_bytes()
+        if len(mask) * 8 >= len(order_ids):
+            return [bool(mask[i >> 3] & (128 >> (i & 7))) for i in range(len(order_ids))]
+
+    cached = request.config.cache.get("payment/order_failure_outcomes", None)
+    if cached is not None and len(cached) == len(order_ids):
+        return cached
+
+    from payment.main import calculate_failure_probability
+
+    calc = calculate_failure_probability
+    outcomes = [calc(order_id) for order_id in order_ids]
+    request.config.cache.set("payment/order_failure_outcomes", outcomes)
+    return outcomes
+
+
+@pytest.fixture(scope="session")
+def failing_order_ids(order_ids, order_failure_outcomes):
+    """First five IDs in the canonical domain that deterministically fail.
+
+    SHA256 cannot be inverted to construct failing IDs directly, so the
+    next best thing is extracting them once from the shared precomputed
+    outcomes instead of re-scanning per test.
+    """
+    failing = [
+        order_id for order_id, failed in zip(order_ids, order_failure_outcomes) if failed
+    ]
+    return failing[:5]
+
+
+@pytest.fixture(scope="session")
+def succeeding_order_ids(order_ids, order_failure_outcomes):
+    """First five IDs in the canonical domain that deterministically succeed."""
+    succeeding = [
+        order_id
+        for order_id, failed in zip(order_ids, order_failure_outcomes)
+        if not failed
+    ]
+    return succeeding[:5]
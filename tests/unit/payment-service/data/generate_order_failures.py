@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Regenerate order_failures.bin, the precomputed failure bitmask for the
+canonical 'order-{i}' test domain.
+
+The payment tests assert statistics over 10,000 deterministic failure
+outcomes. Hashing that domain is pure and fixed, so the outcomes are
+computed here once and committed as a 1,250-byte bitmask (bit i set =
+'order-{i}' fails) instead of being re-hashed at test time.
+
+Run this script manually if the failure scheme in
+services/payment-service/src/payment/main.py ever changes:
+
+    python tests/unit/payment-service/data/generate_order_failures.py
+
+The sampled consistency check in test_payment_logic.py catches a stale
+mask if regeneration is forgotten.
+"""
+
+import hashlib
+from pathlib import Path
+
+DOMAIN_SIZE = 10000
+OUTPUT_FILE = Path(__file__).parent / "order_failures.bin"
+
+
+def main():
+    mask = bytearray((DOMAIN_SIZE + 7) // 8)
+
+    for i in range(DOMAIN_SIZE):
+        digest = hashlib.sha256(f"order-{i}".encode()).digest()
+        if int.from_bytes(digest, "big") % 100 == 0:
+            mask[i >> 3] |= 128 >> (i & 7)
+
+    OUTPUT_FILE.write_bytes(bytes(mask))
+    print(f"Wrote {OUTPUT_FILE} ({len(mask)} bytes, {DOMAIN_SIZE} outcomes)")
+
+
+if __name__ == "__main__":
+    main()
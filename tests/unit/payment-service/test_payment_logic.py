@@ -11,16 +11,21 @@ Workshop: From Commit to Culprit - Payment Service Tests
 
 import pytest
 import hashlib
-import sys
-from pathlib import Path
-
-# Add the service to the path
-service_path = Path(__file__).parent.parent.parent.parent / "services" / "payment-service" / "src"
-sys.path.insert(0, str(service_path))
 
+# The service source tree is added to sys.path by conftest.py
 from payment.main import calculate_failure_probability
 
 
+def _failure_outcomes(order_ids):
+    """Compute failure outcomes for a batch of order IDs in one pass.
+
+    Used by the bulk tests so each keeps a single tight comprehension
+    instead of its own accumulation loop.
+    """
+    calc = calculate_failure_probability
+    return [calc(order_id) for order_id in order_ids]
+
+
 class TestFailureProbability:
     """Test deterministic failure probability calculation."""
 
@@ -28,35 +33,26 @@ class TestFailureProbability:
         """Test that same order_id always produces same result."""
         order_id = "test-order-12345"
 
-        result1 = calculate_failure_probability(order_id)
-        result2 = calculate_failure_probability(order_id)
-        result3 = calculate_failure_probability(order_id)
+        # The production lru_cache makes the repeated calls cost a
+        # single hash
+        results = {calculate_failure_probability(order_id) for _ in range(3)}
 
-        assert result1 == result2 == result3
+        assert len(results) == 1
 
-    def test_failure_probability_different_ids(self):
+    def test_failure_probability_different_ids(self, order_failure_outcomes):
         """Test that different order IDs can produce different results."""
-        results = set()
-
         # Test 100 different order IDs
-        for i in range(100):
-            order_id = f"order-{i}"
-            result = calculate_failure_probability(order_id)
-            results.add(result)
+        results = set(order_failure_outcomes[:100])
 
         # We should have both True and False results
         # (statistically very likely with 100 samples and 1% failure rate)
         assert len(results) > 1, "Should have both success and failure cases"
 
-    def test_failure_probability_distribution(self):
+    @pytest.mark.slow
+    def test_failure_probability_distribution(self, order_failure_outcomes):
         """Test that failure rate is approximately 1%."""
-        failure_count = 0
-        total_count = 10000
-
-        for i in range(total_count):
-            order_id = f"order-{i}"
-            if calculate_failure_probability(order_id):
-                failure_count += 1
+        total_count = len(order_failure_outcomes)
+        failure_count = sum(order_failure_outcomes)
 
         # Calculate failure rate
         failure_rate = failure_count / total_count
@@ -67,88 +63,68 @@ class TestFailureProbability:
         assert 0.005 <= failure_rate <= 0.015, \
             f"Failure rate {failure_rate:.3%} should be approximately 1%"
 
+        # Spot-check the precomputed outcomes against the live function,
+        # guarding against a stale committed bitmask (see conftest.py)
+        for i in range(0, total_count, 500):
+            assert calculate_failure_probability(f"order-{i}") == order_failure_outcomes[i]
+
     def test_failure_probability_uses_sha256(self):
         """Test that the function uses SHA256 hashing."""
         order_id = "test-order"
 
-        # Calculate expected hash value
-        hash_value = int(hashlib.sha256(order_id.encode()).hexdigest(), 16)
+        # Calculate expected hash value. int.from_bytes on the raw
+        # digest skips the hex round-trip; the full 32 bytes are used
+        # because truncating the digest would change the modulus.
+        # usedforsecurity=False matches the production call and skips
+        # the FIPS-provider indirection on OpenSSL 3.
+        digest = hashlib.sha256(order_id.encode(), usedforsecurity=False).digest()
+        hash_value = int.from_bytes(digest, "big")
         expected_failure = (hash_value % 100) == 0
 
         actual_failure = calculate_failure_probability(order_id)
 
         assert actual_failure == expected_failure
 
-    def test_failure_probability_specific_failing_ids(self):
+    def test_failure_probability_specific_failing_ids(self, failing_order_ids):
         """Test specific order IDs that should fail."""
-        # Find order IDs that hash to multiples of 100
-        failing_ids = []
-
-        for i in range(10000):
-            order_id = f"order-{i}"
-            if calculate_failure_probability(order_id):
-                failing_ids.append(order_id)
-
-            if len(failing_ids) >= 5:
-                break
+        assert len(failing_order_ids) == 5
 
         # Verify they consistently fail
-        for order_id in failing_ids:
+        for order_id in failing_order_ids:
             assert calculate_failure_probability(order_id) is True
 
-    def test_failure_probability_specific_succeeding_ids(self):
+    def test_failure_probability_specific_succeeding_ids(self, succeeding_order_ids):
         """Test specific order IDs that should succeed."""
-        # Find order IDs that don't fail
-        succeeding_ids = []
-
-        for i in range(100):
-            order_id = f"order-success-{i}"
-            if not calculate_failure_probability(order_id):
-                succeeding_ids.append(order_id)
-
-            if len(succeeding_ids) >= 5:
-                break
+        assert len(succeeding_order_ids) == 5
 
         # Verify they consistently succeed
-        for order_id in succeeding_ids:
+        for order_id in succeeding_order_ids:
             assert calculate_failure_probability(order_id) is False
 
-    def test_failure_probability_empty_string(self):
-        """Test failure probability with empty order ID."""
-        result = calculate_failure_probability("")
-
-        # Should still work (deterministic for empty string)
-        assert isinstance(result, bool)
-
-        # Verify consistency
-        assert result == calculate_failure_probability("")
-
-    def test_failure_probability_special_characters(self):
-        """Test failure probability with special characters in order ID."""
-        special_order_ids = [
+    @pytest.mark.parametrize(
+        "order_id",
+        [
+            "",
             "order-with-dashes-123",
             "order_with_underscores_456",
             "order.with.dots.789",
             "order@with#special$chars",
-            "order-with-unicode-😀"
-        ]
-
-        for order_id in special_order_ids:
-            result = calculate_failure_probability(order_id)
-            assert isinstance(result, bool)
-
-            # Verify deterministic behavior
-            assert result == calculate_failure_probability(order_id)
-
-    def test_failure_probability_long_order_id(self):
-        """Test failure probability with very long order ID."""
-        long_order_id = "order-" + ("x" * 1000)
-
-        result = calculate_failure_probability(long_order_id)
+            "order-with-unicode-😀",
+            "order-" + ("x" * 1000),
+        ],
+        ids=["empty", "dashes", "underscores", "dots", "special-chars", "unicode", "long"],
+    )
+    def test_failure_probability_edge_case_ids(self, order_id):
+        """Test failure probability for unusual order ID shapes.
+
+        Empty, special-character, unicode, and very long IDs all share
+        the same property: the result is a bool and deterministic.
+        """
+        result = calculate_failure_probability(order_id)
         assert isinstance(result, bool)
 
-        # Verify deterministic
-        assert result == calculate_failure_probability(long_order_id)
+        # Verify deterministic behavior
+        assert result == calculate_failure_probability(order_id)
 
     def test_failure_probability_case_sensitivity(self):
         """Test that order ID is case-sensitive."""
@@ -169,51 +145,44 @@ class TestFailureProbability:
 class TestPaymentGatewaySimulation:
     """Test payment gateway simulation behavior."""
 
-    def test_gateway_simulation_reproducibility(self):
+    @pytest.mark.parametrize(
+        "order_id",
+        ["order-reproducible-1", "order-reproducible-2", "order-reproducible-3"],
+    )
+    def test_gateway_simulation_reproducibility(self, order_id):
         """Test that payment outcomes are reproducible for same order ID."""
-        # This test verifies the overall payment flow is reproducible
-        test_order_ids = [
-            "order-reproducible-1",
-            "order-reproducible-2",
-            "order-reproducible-3"
-        ]
-
-        for order_id in test_order_ids:
-            result1 = calculate_failure_probability(order_id)
-            result2 = calculate_failure_probability(order_id)
-
-            assert result1 == result2, \
-                f"Payment outcome for {order_id} should be reproducible"
+        # This test verifies the overall payment flow is reproducible;
+        # the second call is served from the production lru_cache
+        assert calculate_failure_probability(order_id) == \
+            calculate_failure_probability(order_id), \
+            f"Payment outcome for {order_id} should be reproducible"
 
+    @pytest.mark.slow
     def test_gateway_simulation_variety(self):
         """Test that gateway produces variety of outcomes across different orders."""
-        outcomes = set()
-
-        for i in range(1000):
-            order_id = f"order-variety-{i}"
-            result = calculate_failure_probability(order_id)
-            outcomes.add(result)
+        outcomes = set(_failure_outcomes(f"order-variety-{i}" for i in range(1000)))
 
         # Should have both success and failure outcomes
         assert True in outcomes, "Should have at least one success"
         assert False in outcomes, "Should have at least one failure"
 
+    @pytest.mark.slow
     def test_gateway_failure_rate_consistency(self):
         """Test that failure rate is consistent across different batches."""
         batch_size = 1000
         num_batches = 5
 
-        failure_rates = []
-
-        for batch in range(num_batches):
-            failure_count = 0
-            for i in range(batch_size):
-                order_id = f"batch-{batch}-order-{i}"
-                if calculate_failure_probability(order_id):
-                    failure_count += 1
-
-            failure_rate = failure_count / batch_size
-            failure_rates.append(failure_rate)
+        # Compute all 5000 outcomes in one flat pass, then carve the
+        # result into per-batch slices
+        outcomes = _failure_outcomes(
+            f"batch-{batch}-order-{i}"
+            for batch in range(num_batches)
+            for i in range(batch_size)
+        )
+        failure_rates = [
+            sum(outcomes[batch * batch_size:(batch + 1) * batch_size]) / batch_size
+            for batch in range(num_batches)
+        ]
 
         # All batches should have similar failure rates (around 1%)
         avg_failure_rate = sum(failure_rates) / len(failure_rates)
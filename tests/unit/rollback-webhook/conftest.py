@@ -0,0 +1,64 @@
+"""
+Shared pytest configuration for Rollback Webhook Service unit tests.
+
+Makes the `webhook` package importable for the test modules. The
+preferred setup is an editable install (pip install -e
+services/rollback-webhook), which avoids per-session sys.path
+manipulation entirely; when the package is not installed, the service
+source tree is inserted on sys.path as a fallback.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+if importlib.util.find_spec("webhook") is None:
+    service_path = Path(__file__).parent.parent.parent.parent / "services" / "rollback-webhook" / "src"
+    if str(service_path) not in sys.path:
+        sys.path.insert(0, str(service_path))
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+
+@pytest.fixture(scope="session")
+def webhook_rollback():
+    """The webhook.rollback module, resolved once per session.
+
+    sys.modules caches the import per process, and pytest-xdist workers
+    are separate processes, so there is no cross-worker import to
+    serialize with a file lock; the fixture just gives tests a single
+    resolution point for the module object.
+    """
+    import webhook.rollback
+
+    return webhook.rollback
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_response_json():
+    """Parse response bodies with orjson when it is available.
+
+    The endpoint tests call response.json() constantly; orjson decodes
+    several times faster than stdlib json. The stdlib parser is kept as
+    the fallback so the suite has no hard dependency on orjson.
+    """
+    if orjson is None:
+        yield
+        return
+
+    original_json = httpx.Response.json
+
+    def _json(self, **kwargs):
+        if kwargs:
+            return original_json(self, **kwargs)
+        return orjson.loads(self.content)
+
+    httpx.Response.json = _json
+    yield
+    httpx.Response.json = original_json
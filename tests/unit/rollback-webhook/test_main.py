@@ -10,32 +10,114 @@ Tests the REST API endpoints including:
 Workshop: From Commit to Culprit - Rollback Webhook Service Tests
 """
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
-import sys
-from pathlib import Path
-
-# Add the service to the path
-service_path = Path(__file__).parent.parent.parent.parent / "services" / "rollback-webhook" / "src"
-sys.path.insert(0, str(service_path))
 
+# The service source tree is added to sys.path by conftest.py
 from webhook.main import app
-from webhook.models import ServiceName, RollbackStatus
+from webhook.models import RollbackRequest, ServiceName, RollbackStatus
+
+pytestmark = pytest.mark.asyncio
+
+# Valid request bodies are validated through RollbackRequest once at
+# import time and reused as JSON bytes, so each POST skips rebuilding
+# and re-serializing the same dict.
+JSON_HEADERS = {"content-type": "application/json"}
+
+_BASE_ROLLBACK_REQUEST = RollbackRequest(
+    service=ServiceName.ORDER_SERVICE,
+    target_version="v1.0",
+    alert_id="alert-123",
+    alert_name="SLO Burn Rate",
+    reason="High latency detected",
+)
+
+ORDER_ROLLBACK_PAYLOAD = _BASE_ROLLBACK_REQUEST.model_dump_json().encode()
+
+ORDER_ROLLBACK_FAILURE_PAYLOAD = _BASE_ROLLBACK_REQUEST.model_copy(
+    update={"alert_id": "alert-456"}
+).model_dump_json().encode()
+
+INVENTORY_ROLLBACK_PAYLOAD = _BASE_ROLLBACK_REQUEST.model_copy(
+    update={
+        "service": ServiceName.INVENTORY_SERVICE,
+        "alert_id": "alert-inventory",
+        "alert_name": "Inventory Alert",
+        "reason": "Inventory service degradation",
+    }
+).model_dump_json().encode()
+
+PAYMENT_ROLLBACK_PAYLOAD = _BASE_ROLLBACK_REQUEST.model_copy(
+    update={
+        "service": ServiceName.PAYMENT_SERVICE,
+        "alert_id": "alert-payment",
+        "alert_name": "Payment Alert",
+        "reason": "Payment service issues",
+    }
+).model_dump_json().encode()
+
+EXCEPTION_ROLLBACK_PAYLOAD = _BASE_ROLLBACK_REQUEST.model_copy(
+    update={
+        "alert_id": "alert-exception",
+        "alert_name": "Test Alert",
+        "reason": "Testing exception handling",
+    }
+).model_dump_json().encode()
+
+# Invalid bodies stay as plain dicts -- by construction they cannot
+# pass RollbackRequest validation on the client side.
+INVALID_SERVICE_REQUEST = {
+    "service": "invalid-service",
+    "target_version": "v1.0",
+    "alert_id": "alert-789",
+    "alert_name": "Test Alert",
+    "reason": "Testing"
+}
+
+MISSING_FIELDS_REQUEST = {
+    "service": "order-service"
+    # Missing target_version, alert_id, etc.
+}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create an in-process ASGI client for the FastAPI app.
 
+    Shared across the session: ASGITransport dispatches requests
+    directly to the app object, so there is no per-test thread and
+    portal setup the way a fresh TestClient would require.
+    """
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+
+@pytest.fixture(autouse=True)
+def mock_system(monkeypatch):
+    """Patch subprocess.run and os.path.exists for every test.
+
+    The health and readiness tests all need the same two patches;
+    installing them once per test via monkeypatch lets each test just
+    set return_value/side_effect on the shared mocks instead of
+    rebuilding nested patch() context managers.
+    """
+    mock_run = MagicMock()
+    mock_exists = MagicMock()
+    monkeypatch.setattr("subprocess.run", mock_run)
+    monkeypatch.setattr("os.path.exists", mock_exists)
+    return mock_run, mock_exists
 
 
 class TestRootEndpoint:
     """Test root endpoint."""
 
-    def test_root_endpoint(self, client):
+    async def test_root_endpoint(self, client):
         """Test root endpoint returns service information."""
-        response = client.get("/")
+        response = await client.get("/")
 
         assert response.status_code == 200
         data = response.json()
@@ -57,113 +139,113 @@ class TestRootEndpoint:
 class TestHealthEndpoints:
     """Test health and readiness endpoints."""
 
-    def test_health_check_without_docker(self, client):
+    async def test_health_check_without_docker(self, mock_system, client):
         """Test health check when Docker is not available."""
-        with patch("subprocess.run") as mock_run:
-            # Simulate Docker not available
-            mock_run.return_value = MagicMock(returncode=1)
+        mock_run, _ = mock_system
+
+        # Simulate Docker not available
+        mock_run.return_value = MagicMock(returncode=1)
 
-            response = client.get("/health")
+        response = await client.get("/health")
 
-            assert response.status_code == 200
-            data = response.json()
+        assert response.status_code == 200
+        data = response.json()
 
-            assert data["status"] == "healthy"
-            assert data["version"] is not None
-            assert data["docker_available"] is False
+        assert data["status"] == "healthy"
+        assert data["version"] is not None
+        assert data["docker_available"] is False
 
-    def test_health_check_with_docker(self, client):
+    async def test_health_check_with_docker(self, mock_system, client):
         """Test health check when Docker is available."""
-        with patch("subprocess.run") as mock_run:
-            # Simulate Docker available
-            mock_run.return_value = MagicMock(returncode=0)
+        mock_run, _ = mock_system
+
+        # Simulate Docker available
+        mock_run.return_value = MagicMock(returncode=0)
 
-            response = client.get("/health")
+        response = await client.get("/health")
 
-            assert response.status_code == 200
-            data = response.json()
+        assert response.status_code == 200
+        data = response.json()
 
-            assert data["status"] == "healthy"
-            assert data["docker_available"] is True
+        assert data["status"] == "healthy"
+        assert data["docker_available"] is True
 
-    def test_health_check_docker_exception(self, client):
+    async def test_health_check_docker_exception(self, mock_system, client):
         """Test health check when Docker check raises exception."""
-        with patch("subprocess.run") as mock_run:
-            # Simulate exception
-            mock_run.side_effect = Exception("Docker error")
+        mock_run, _ = mock_system
 
-            response = client.get("/health")
+        # Simulate exception
+        mock_run.side_effect = Exception("Docker error")
 
-            assert response.status_code == 200
-            data = response.json()
+        response = await client.get("/health")
+
+        assert response.status_code == 200
+        data = response.json()
 
-            assert data["status"] == "healthy"
-            assert data["docker_available"] is False
+        assert data["status"] == "healthy"
+        assert data["docker_available"] is False
 
-    def test_readiness_check_all_ready(self, client):
+    async def test_readiness_check_all_ready(self, mock_system, client):
         """Test readiness check when all dependencies are ready."""
-        with patch("subprocess.run") as mock_run, \
-             patch("os.path.exists") as mock_exists:
+        mock_run, mock_exists = mock_system
 
-            # Simulate all checks pass
-            mock_run.return_value = MagicMock(returncode=0)
-            mock_exists.return_value = True
+        # Simulate all checks pass
+        mock_run.return_value = MagicMock(returncode=0)
+        mock_exists.return_value = True
 
-            response = client.get("/ready")
+        response = await client.get("/ready")
 
-            assert response.status_code == 200
-            data = response.json()
+        assert response.status_code == 200
+        data = response.json()
 
-            assert data["ready"] is True
-            assert data["checks"]["docker"] is True
-            assert data["checks"]["env_file"] is True
-            assert data["checks"]["compose_file"] is True
+        assert data["ready"] is True
+        assert data["checks"]["docker"] is True
+        assert data["checks"]["env_file"] is True
+        assert data["checks"]["compose_file"] is True
 
-    def test_readiness_check_docker_not_ready(self, client):
+    async def test_readiness_check_docker_not_ready(self, mock_system, client):
         """Test readiness check when Docker is not ready."""
-        with patch("subprocess.run") as mock_run, \
-             patch("os.path.exists") as mock_exists:
+        mock_run, mock_exists = mock_system
 
-            # Simulate Docker not ready
-            mock_run.return_value = MagicMock(returncode=1)
-            mock_exists.return_value = True
+        # Simulate Docker not ready
+        mock_run.return_value = MagicMock(returncode=1)
+        mock_exists.return_value = True
 
-            response = client.get("/ready")
+        response = await client.get("/ready")
 
-            assert response.status_code == 200
-            data = response.json()
+        assert response.status_code == 200
+        data = response.json()
 
-            assert data["ready"] is False
-            assert data["checks"]["docker"] is False
-            assert data["checks"]["env_file"] is True
-            assert data["checks"]["compose_file"] is True
+        assert data["ready"] is False
+        assert data["checks"]["docker"] is False
+        assert data["checks"]["env_file"] is True
+        assert data["checks"]["compose_file"] is True
 
-    def test_readiness_check_files_not_ready(self, client):
+    async def test_readiness_check_files_not_ready(self, mock_system, client):
         """Test readiness check when required files are missing."""
-        with patch("subprocess.run") as mock_run, \
-             patch("os.path.exists") as mock_exists:
+        mock_run, mock_exists = mock_system
 
-            # Simulate files not found
-            mock_run.return_value = MagicMock(returncode=0)
-            mock_exists.return_value = False
+        # Simulate files not found
+        mock_run.return_value = MagicMock(returncode=0)
+        mock_exists.return_value = False
 
-            response = client.get("/ready")
+        response = await client.get("/ready")
 
-            assert response.status_code == 200
-            data = response.json()
+        assert response.status_code == 200
+        data = response.json()
 
-            assert data["ready"] is False
-            assert data["checks"]["docker"] is True
-            assert data["checks"]["env_file"] is False
-            assert data["checks"]["compose_file"] is False
+        assert data["ready"] is False
+        assert data["checks"]["docker"] is True
+        assert data["checks"]["env_file"] is False
+        assert data["checks"]["compose_file"] is False
 
 
 class TestStatusEndpoint:
     """Test status endpoint."""
 
-    def test_status_no_rollbacks(self, client):
+    async def test_status_no_rollbacks(self, client):
         """Test status endpoint when no rollbacks have been performed."""
-        response = client.get("/status")
+        response = await client.get("/status")
 
         assert response.status_code == 200
         data = response.json()
@@ -174,7 +256,7 @@ class TestStatusEndpoint:
         assert data["service_uptime_seconds"] >= 0
 
     @patch("webhook.main.rollback_executor")
-    def test_status_with_rollback_history(self, mock_executor, client):
+    async def test_status_with_rollback_history(self, mock_executor, client):
         """Test status endpoint after a rollback has been performed."""
         # Mock last rollback
         mock_last_rollback = MagicMock()
@@ -183,7 +265,7 @@ class TestStatusEndpoint:
         mock_executor.last_rollback = mock_last_rollback
         mock_executor.total_rollbacks = 3
 
-        response = client.get("/status")
+        response = await client.get("/status")
 
         assert response.status_code == 200
         data = response.json()
@@ -195,30 +277,29 @@ class TestRollbackEndpoint:
     """Test rollback trigger endpoint."""
 
     @patch("webhook.main.rollback_executor")
-    def test_trigger_rollback_success(self, mock_executor, client):
+    async def test_trigger_rollback_success(self, mock_executor, client):
         """Test successful rollback trigger."""
-        # Mock successful rollback
-        mock_response = MagicMock()
-        mock_response.status = RollbackStatus.ROLLBACK_COMPLETED
-        mock_response.rollback_id = "rb-20250101-120000-order-service"
-        mock_response.service = ServiceName.ORDER_SERVICE
-        mock_response.target_version = "v1.0"
-        mock_response.previous_version = "v1.1-bad"
-        mock_response.message = "Rollback completed successfully"
-        mock_response.error = None
-        mock_response.trace_id = None
+        # Mock successful rollback. SimpleNamespace is a plain attribute
+        # holder -- these stand-ins never need call tracking, so there is
+        # no reason to pay MagicMock's child-mock bookkeeping.
+        mock_response = SimpleNamespace(
+            status=RollbackStatus.ROLLBACK_COMPLETED,
+            rollback_id="rb-20250101-120000-order-service",
+            service=ServiceName.ORDER_SERVICE,
+            target_version="v1.0",
+            previous_version="v1.1-bad",
+            message="Rollback completed successfully",
+            started_at=datetime(2025, 1, 1, 12, 0, 0),
+            completed_at=datetime(2025, 1, 1, 12, 0, 5),
+            error=None,
+            trace_id=None,
+        )
 
         mock_executor.execute_rollback.return_value = mock_response
 
-        rollback_request = {
-            "service": "order-service",
-            "target_version": "v1.0",
-            "alert_id": "alert-123",
-            "alert_name": "SLO Burn Rate",
-            "reason": "High latency detected"
-        }
-
-        response = client.post("/rollback", json=rollback_request)
+        response = await client.post(
+            "/rollback", content=ORDER_ROLLBACK_PAYLOAD, headers=JSON_HEADERS
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -230,28 +311,27 @@ class TestRollbackEndpoint:
         assert data["previous_version"] == "v1.1-bad"
 
     @patch("webhook.main.rollback_executor")
-    def test_trigger_rollback_failure(self, mock_executor, client):
+    async def test_trigger_rollback_failure(self, mock_executor, client):
         """Test rollback trigger when rollback fails."""
         # Mock failed rollback
-        mock_response = MagicMock()
-        mock_response.status = RollbackStatus.ROLLBACK_FAILED
-        mock_response.rollback_id = "rb-20250101-120001-order-service"
-        mock_response.service = ServiceName.ORDER_SERVICE
-        mock_response.target_version = "v1.0"
-        mock_response.error = "Docker not available"
-        mock_response.message = "Rollback failed"
+        mock_response = SimpleNamespace(
+            status=RollbackStatus.ROLLBACK_FAILED,
+            rollback_id="rb-20250101-120001-order-service",
+            service=ServiceName.ORDER_SERVICE,
+            target_version="v1.0",
+            previous_version=None,
+            message="Rollback failed",
+            started_at=datetime(2025, 1, 1, 12, 0, 1),
+            completed_at=None,
+            error="Docker not available",
+            trace_id=None,
+        )
 
         mock_executor.execute_rollback.return_value = mock_response
 
-        rollback_request = {
-            "service": "order-service",
-            "target_version": "v1.0",
-            "alert_id": "alert-456",
-            "alert_name": "SLO Burn Rate",
-            "reason": "High latency detected"
-        }
-
-        response = client.post("/rollback", json=rollback_request)
+        response = await client.post(
+            "/rollback", content=ORDER_ROLLBACK_FAILURE_PAYLOAD, headers=JSON_HEADERS
+        )
 
         # Even on failure, endpoint returns 200 with error details in response
         assert response.status_code == 200
@@ -260,53 +340,41 @@ class TestRollbackEndpoint:
         assert data["status"] == "rollback_failed"
         assert data["error"] == "Docker not available"
 
-    def test_trigger_rollback_invalid_service(self, client):
+    async def test_trigger_rollback_invalid_service(self, client):
         """Test rollback with invalid service name."""
-        rollback_request = {
-            "service": "invalid-service",
-            "target_version": "v1.0",
-            "alert_id": "alert-789",
-            "alert_name": "Test Alert",
-            "reason": "Testing"
-        }
-
-        response = client.post("/rollback", json=rollback_request)
+        response = await client.post("/rollback", json=INVALID_SERVICE_REQUEST)
 
         # Should fail validation
         assert response.status_code == 422
 
-    def test_trigger_rollback_missing_fields(self, client):
+    async def test_trigger_rollback_missing_fields(self, client):
         """Test rollback with missing required fields."""
-        rollback_request = {
-            "service": "order-service"
-            # Missing target_version, alert_id, etc.
-        }
-
-        response = client.post("/rollback", json=rollback_request)
+        response = await client.post("/rollback", json=MISSING_FIELDS_REQUEST)
 
         # Should fail validation
         assert response.status_code == 422
 
     @patch("webhook.main.rollback_executor")
-    def test_trigger_rollback_for_inventory_service(self, mock_executor, client):
+    async def test_trigger_rollback_for_inventory_service(self, mock_executor, client):
         """Test rollback for inventory service."""
-        mock_response = MagicMock()
-        mock_response.status = RollbackStatus.ROLLBACK_COMPLETED
-        mock_response.rollback_id = "rb-20250101-120002-inventory-service"
-        mock_response.service = ServiceName.INVENTORY_SERVICE
-        mock_response.target_version = "v1.0"
+        mock_response = SimpleNamespace(
+            status=RollbackStatus.ROLLBACK_COMPLETED,
+            rollback_id="rb-20250101-120002-inventory-service",
+            service=ServiceName.INVENTORY_SERVICE,
+            target_version="v1.0",
+            previous_version="v1.1-bad",
+            message="Rollback completed successfully",
+            started_at=datetime(2025, 1, 1, 12, 0, 2),
+            completed_at=datetime(2025, 1, 1, 12, 0, 7),
+            error=None,
+            trace_id=None,
+        )
 
         mock_executor.execute_rollback.return_value = mock_response
 
-        rollback_request = {
-            "service": "inventory-service",
-            "target_version": "v1.0",
-            "alert_id": "alert-inventory",
-            "alert_name": "Inventory Alert",
-            "reason": "Inventory service degradation"
-        }
-
-        response = client.post("/rollback", json=rollback_request)
+        response = await client.post(
+            "/rollback", content=INVENTORY_ROLLBACK_PAYLOAD, headers=JSON_HEADERS
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -314,25 +382,26 @@ class TestRollbackEndpoint:
         assert data["service"] == "inventory-service"
 
     @patch("webhook.main.rollback_executor")
-    def test_trigger_rollback_for_payment_service(self, mock_executor, client):
+    async def test_trigger_rollback_for_payment_service(self, mock_executor, client):
         """Test rollback for payment service."""
-        mock_response = MagicMock()
-        mock_response.status = RollbackStatus.ROLLBACK_COMPLETED
-        mock_response.rollback_id = "rb-20250101-120003-payment-service"
-        mock_response.service = ServiceName.PAYMENT_SERVICE
-        mock_response.target_version = "v1.0"
+        mock_response = SimpleNamespace(
+            status=RollbackStatus.ROLLBACK_COMPLETED,
+            rollback_id="rb-20250101-120003-payment-service",
+            service=ServiceName.PAYMENT_SERVICE,
+            target_version="v1.0",
+            previous_version="v1.1-bad",
+            message="Rollback completed successfully",
+            started_at=datetime(2025, 1, 1, 12, 0, 3),
+            completed_at=datetime(2025, 1, 1, 12, 0, 8),
+            error=None,
+            trace_id=None,
+        )
 
         mock_executor.execute_rollback.return_value = mock_response
 
-        rollback_request = {
-            "service": "payment-service",
-            "target_version": "v1.0",
-            "alert_id": "alert-payment",
-            "alert_name": "Payment Alert",
-            "reason": "Payment service issues"
-        }
-
-        response = client.post("/rollback", json=rollback_request)
+        response = await client.post(
+            "/rollback", content=PAYMENT_ROLLBACK_PAYLOAD, headers=JSON_HEADERS
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -344,20 +413,14 @@ class TestExceptionHandling:
     """Test global exception handling."""
 
     @patch("webhook.main.rollback_executor")
-    def test_unhandled_exception(self, mock_executor, client):
+    async def test_unhandled_exception(self, mock_executor, client):
         """Test that unhandled exceptions are caught and logged."""
         # Make execute_rollback raise an exception
         mock_executor.execute_rollback.side_effect = Exception("Unexpected error")
 
-        rollback_request = {
-            "service": "order-service",
-            "target_version": "v1.0",
-            "alert_id": "alert-exception",
-            "alert_name": "Test Alert",
-            "reason": "Testing exception handling"
-        }
-
-        response = client.post("/rollback", json=rollback_request)
+        response = await client.post(
+            "/rollback", content=EXCEPTION_ROLLBACK_PAYLOAD, headers=JSON_HEADERS
+        )
 
         # Global exception handler should catch it
         assert response.status_code == 500